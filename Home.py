@@ -2,11 +2,15 @@ import streamlit as st
 import pandas as pd
 import requests
 import plotly.express as px
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from newsapi import NewsApiClient
 import time
+from utils.prewarm import WarmStore, start_prewarmer
+from utils.replay import replayable
+from utils.sentiment import label_sentiment, score_texts
+from utils.review_index import ReviewIndex, render_drill_down
+from utils.rollups import GRANULARITIES, build_rollups, rollup_frame
 
 # --- Page Configuration ---
 st.set_page_config(page_title="TrendTrackr", page_icon="🧠", layout="wide")
@@ -33,13 +37,12 @@ st.sidebar.markdown(
 )
 
 # --- Core Functions / Tools ---
-analyzer = SentimentIntensityAnalyzer()
-
 @st.cache_data(ttl=3600)
 def analyze_sentiment(texts):
     df = pd.DataFrame(texts, columns=["text"])
-    df["compound"] = df["text"].apply(lambda t: analyzer.polarity_scores(t)["compound"])
-    df["sentiment"] = df["compound"].apply(lambda c: "Positive" if c >= 0.05 else "Negative" if c <= -0.05 else "Neutral")
+    # Goes through the shared scoring service when SCORING_SERVICE_URL is set, in-process otherwise
+    df["compound"] = score_texts(df["text"], st.secrets.get("SCORING_SERVICE_URL"), backend=st.secrets.get("SENTIMENT_BACKEND"))
+    df["sentiment"] = df["compound"].apply(label_sentiment)
     return df
 
 @st.cache_data(ttl=3600)
@@ -50,16 +53,62 @@ def generate_wordcloud(text_series, colormap='plasma'):
     wc = WordCloud(width=1200, height=600, background_color='white', colormap=colormap, max_words=150, contour_width=3, contour_color='steelblue').generate(text)
     return wc
 
-@st.cache_data(ttl=3600)
-def fetch_news(query):
+def request_news(query):
     api_key = st.secrets.get("NEWS_API_KEY", "0ac47642d2d8408e9bf075473df6cbc7")
     newsapi = NewsApiClient(api_key=api_key)
     try:
-        articles = newsapi.get_everything(q=query, language='en', sort_by='relevancy', page_size=100).get('articles', [])
+        params = {"q": query, "language": "en", "sort_by": "relevancy", "page_size": 100}
+        articles = replayable("newsapi", params, lambda: newsapi.get_everything(**params)).get('articles', [])
         return articles
     except Exception as e:
         return {"error": str(e)}
 
+@st.cache_data(ttl=3600)
+def fetch_news(query):
+    return request_news(query)
+
+def news_texts(articles):
+    df = pd.DataFrame(articles)
+    df["text"] = df["title"]
+    return df
+
+def score_news(articles):
+    df = news_texts(articles)
+    df_sentiment = analyze_sentiment(df["text"].dropna())
+    # df already carries "text"; a second copy would make df["text"] a DataFrame
+    return pd.concat([df.reset_index(drop=True), df_sentiment.drop(columns="text").reset_index(drop=True)], axis=1)
+
+# --- Background Pre-warming of Hot Topics ---
+PROVIDERS = ["General", "AWS", "Azure", "Cloudflare", "Fastly", "Google Cloud"]
+
+@st.cache_resource
+def get_warm_store():
+    return WarmStore(ttl=3600)
+
+def warm_news_topic(query):
+    # Fetch outside st.cache_data and only swap the stored result in on success
+    articles = request_news(query)
+    if isinstance(articles, dict) and "error" in articles:
+        raise RuntimeError(articles["error"])
+    if articles:
+        get_warm_store().put(query, score_news(articles))
+
+@st.cache_resource
+def get_prewarmer():
+    # One refresher per server process. It only refreshes hot topics that some
+    # session actually requested within the TTL, so an idle app makes no calls.
+    hot_topics = list(st.secrets.get("PREWARM_TOPICS", [p for p in PROVIDERS if p != "General"]))
+    store = get_warm_store()
+    return start_prewarmer(
+        warm_news_topic, lambda: store.recently_requested(hot_topics),
+        interval=st.secrets.get("PREWARM_INTERVAL", 3000),
+        jitter=st.secrets.get("PREWARM_JITTER", 300),
+        max_workers=st.secrets.get("PREWARM_WORKERS", 2),
+    )
+
+if st.secrets.get("PREWARM_ENABLED", False):
+    get_prewarmer()
+
 # --- Main Dashboard UI ---
 st.title("📈 TrendTrackr: AI-Powered Dashboard")
 
@@ -69,8 +118,7 @@ tab_news, tab_reviews, tab_research = st.tabs(["🧠 News Sentiment", "🛒 Amaz
 with tab_news:
     st.header("Analyze Public Sentiment from News Headlines")
     
-    providers = ["General", "AWS", "Azure", "Cloudflare", "Fastly", "Google Cloud"]
-    selected_provider = st.selectbox("Choose a Provider (Optional)", providers, key='news_provider_select')
+    selected_provider = st.selectbox("Choose a Provider (Optional)", PROVIDERS, key='news_provider_select')
     default_query = selected_provider if selected_provider != "General" else ""
 
     with st.form(key='news_search_form'):
@@ -79,17 +127,18 @@ with tab_news:
 
     if submitted:
         with st.spinner("Brewing insights... ☕"):
-            articles = fetch_news(search_query)
+            df = get_warm_store().get(search_query)
+            articles = None if df is not None else fetch_news(search_query)
             if isinstance(articles, dict) and "error" in articles:
                 st.error(articles["error"])
-            elif not articles:
+            elif df is None and not articles:
                 st.warning("No articles found.")
             else:
-                df = pd.DataFrame(articles)
-                df["text"] = df["title"]
-                df_sentiment = analyze_sentiment(df["text"].dropna())
-                df = pd.concat([df.reset_index(drop=True), df_sentiment.reset_index(drop=True)], axis=1)
+                df = df.copy() if df is not None else score_news(articles)
                 st.session_state['news_df'] = df
+                # Parse timestamps once here; the trend tab only reads these rollups
+                st.session_state['news_rollups'] = build_rollups(df["publishedAt"], df["compound"])
+                st.session_state['news_index'] = ReviewIndex(df)
 
     if 'news_df' in st.session_state:
         df = st.session_state['news_df']
@@ -102,17 +151,18 @@ with tab_news:
         col2.metric("💬 Overall Sentiment", sentiment_label)
         col3.metric("📈 Avg. Score", f"{avg_score:.2f}")
 
-        t1, t2, t3 = st.tabs(["📊 Distribution", "📈 Trend", "☁️ Word Cloud"])
+        t1, t2, t3, t4 = st.tabs(["📊 Distribution", "📈 Trend", "☁️ Word Cloud", "🔎 Search Headlines"])
         with t1:
             sentiment_counts = df["sentiment"].value_counts()
             fig_pie = px.pie(sentiment_counts, values=sentiment_counts.values, names=sentiment_counts.index,
                              color=sentiment_counts.index, color_discrete_map={'Positive': '#2ecc71', 'Negative': '#e74c3c', 'Neutral': '#95a5a6'})
             st.plotly_chart(fig_pie, use_container_width=True)
         with t2:
-            df["publishedAt"] = pd.to_datetime(df["publishedAt"])
-            df["date"] = df["publishedAt"].dt.date
-            sentiment_by_day = df.groupby("date")["compound"].mean().reset_index()
-            fig_line = px.line(sentiment_by_day, x="date", y="compound", markers=True, title='Sentiment Trend Over Time')
+            granularity = st.radio("Granularity", list(GRANULARITIES), index=1, horizontal=True, key='news_trend_granularity')
+            sentiment_by_period = rollup_frame(st.session_state['news_rollups'], granularity)
+            if st.session_state['news_rollups']["dropped"]:
+                st.warning(f"{st.session_state['news_rollups']['dropped']} articles had no parseable publish time and are left out of the trend.")
+            fig_line = px.line(sentiment_by_period, x="period", y="compound", markers=True, hover_data=["articles"], title='Sentiment Trend Over Time')
             st.plotly_chart(fig_line, use_container_width=True)
         with t3:
             wordcloud = generate_wordcloud(df['text'])
@@ -120,6 +170,9 @@ with tab_news:
                 st.image(wordcloud.to_array(), caption='Most Frequent Words', use_container_width=True)
             else:
                 st.write("Not enough data to generate a word cloud.")
+        with t4:
+            render_drill_down(df[["title", "publishedAt", "compound", "sentiment"]], st.session_state['news_index'],
+                              "Search Headlines", 'e.g. outage, "data center"', key='news_headline')
 
 # --- Amazon & G2 Reviews Tab (FIXED: Interactive Demo) ---
 with tab_reviews:
@@ -144,6 +197,7 @@ with tab_reviews:
             with st.spinner("Analyzing mock reviews..."):
                 df_reviews = analyze_sentiment(mock_reviews)
                 st.session_state['amazon_df'] = df_reviews
+                st.session_state['amazon_index'] = ReviewIndex(df_reviews)
 
         if 'amazon_df' in st.session_state:
             df = st.session_state['amazon_df']
@@ -169,7 +223,7 @@ with tab_reviews:
                 if neg_text:
                     st.image(generate_wordcloud(neg_text, colormap='Reds').to_array(), caption='Negative Words', use_container_width=True)
             st.markdown("**Detailed Review Analysis**")
-            st.dataframe(df)
+            render_drill_down(df, st.session_state['amazon_index'], "Search Reviews", 'e.g. battery, "heart rate"', key='amazon_review')
 
     with sub_tab_g2:
         st.subheader("Demo: G2 Vendor Search")
@@ -1,13 +1,11 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from wordcloud import WordCloud
 from utils.amazon_api import fetch_amazon_product
 from utils.g2_api import fetch_g2_vendors
-from utils.sentiment import analyze_sentiment
-
-analyzer = SentimentIntensityAnalyzer()
+from utils.sentiment import analyze_sentiment, label_sentiment, score_texts
+from utils.review_index import ReviewIndex, render_drill_down
 
 st.set_page_config(page_title="Amazon & G2 Reviews", page_icon="🛒", layout="wide")
 st.title("🛒 Amazon & G2 Review Sentiment")
@@ -23,19 +21,24 @@ with tab1:
             st.error(product["error"])
         else:
             st.write(f"**Product Title:** {product['title']}")
-            title_sentiment = analyzer.polarity_scores(product['title'])
-            st.write(f"**Title Sentiment:** {title_sentiment}")
+            title_compound = score_texts([product['title']], st.secrets.get("SCORING_SERVICE_URL"), backend=st.secrets.get("SENTIMENT_BACKEND"))[0]
+            st.write(f"**Title Sentiment:** {label_sentiment(title_compound)} ({title_compound:.2f})")
             if product['reviews']:
-                df_reviews = analyze_sentiment(product['reviews'])
-                st.dataframe(df_reviews)
+                df_reviews = analyze_sentiment(product['reviews'], st.secrets.get("SCORING_SERVICE_URL"), backend=st.secrets.get("SENTIMENT_BACKEND"))
+                st.session_state['amazon_reviews'] = (df_reviews, ReviewIndex(df_reviews))
                 wc = WordCloud(width=800, height=400, background_color='white', colormap='plasma').generate(' '.join(df_reviews['text']))
                 fig, ax = plt.subplots()
                 ax.imshow(wc, interpolation='bilinear')
                 ax.axis('off')
                 st.pyplot(fig)
             else:
+                st.session_state.pop('amazon_reviews', None)
                 st.info("No reviews available.")
 
+    if 'amazon_reviews' in st.session_state:
+        df_reviews, index = st.session_state['amazon_reviews']
+        render_drill_down(df_reviews, index, "Search Reviews", 'e.g. battery, "screen protector"', key='amazon_review')
+
 with tab2:
     vendor_query = st.text_input("Search G2 Vendor", value="Salesfor")
     if st.button("Search G2 Vendors"):
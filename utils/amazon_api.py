@@ -1,4 +1,5 @@
 import requests
+from utils.replay import replayable
 
 def fetch_amazon_product(asin, country="US"):
     url = "https://real-time-amazon-data.p.rapidapi.com/product-details"
@@ -7,9 +8,15 @@ def fetch_amazon_product(asin, country="US"):
         "x-rapidapi-key": "b5add04a2amsh97b53fc17139a3ep11f058jsn6a762af25aea"
     }
     params = {"asin": asin, "country": country}
-    try:
+
+    def request():
         response = requests.get(url, headers=headers, params=params)
-        data = response.json()
+        # Quota/auth error bodies must never be recorded as a fixture
+        response.raise_for_status()
+        return response.json()
+
+    try:
+        data = replayable("amazon", params, request)
         return {
             "title": data.get("product_title", ""),
             "reviews": [r.get("review_text", "") for r in data.get("reviews", [])]
@@ -1,4 +1,5 @@
 import requests
+from utils.replay import replayable
 
 def fetch_g2_vendors(query):
     url = "https://g2-products-reviews-users2.p.rapidapi.com/vendor/autocomplete"
@@ -6,8 +7,15 @@ def fetch_g2_vendors(query):
         "x-rapidapi-host": "g2-products-reviews-users2.p.rapidapi.com",
         "x-rapidapi-key": "b5add04a2amsh97b53fc17139a3ep11f058jsn6a762af25aea"
     }
+    params = {"Query": query}
+
+    def request():
+        response = requests.get(url, headers=headers, params=params)
+        # Quota/auth error bodies must never be recorded as a fixture
+        response.raise_for_status()
+        return response.json()
+
     try:
-        response = requests.get(url, headers=headers, params={"Query": query})
-        return response.json().get("vendors", [])
+        return replayable("g2", params, request).get("vendors", [])
     except Exception as e:
         return {"error": str(e)}
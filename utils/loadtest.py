@@ -0,0 +1,231 @@
+import argparse
+import os
+import random
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import newsapi
+import numpy as np
+import pandas as pd
+import requests
+from streamlit import config
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+# Drives N concurrent simulated sessions through the real app scripts with
+# Streamlit's AppTest, with NewsAPI and RapidAPI swapped for local stubs.
+#
+#   python -m utils.loadtest --scenario news --sessions 1,5,10,25 --latency 0.3
+#   (scenarios: news -> Home.py, sapp -> utils/sapp.py, amazon -> pages/Amazon_G2_Reviews.py)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEADLINE_TEMPLATES = [
+    "{q} shares soar after record quarter",
+    "{q} outage disrupts thousands of customers",
+    "{q} announces new partnership",
+    "Analysts warn of slowing growth at {q}",
+    "{q} launches faster, cheaper service tier",
+    "Regulators fine {q} over data handling",
+    "{q} holds annual developer conference",
+]
+REVIEW_TEMPLATES = [
+    "Absolutely love it, the battery life is incredible.",
+    "A total waste of money, the screen scratched on day one.",
+    "It's an okay product. Does the basics but nothing special.",
+    "Best purchase of the year, works perfectly with my phone.",
+    "Had to return it, the sensor was wildly inaccurate.",
+]
+
+
+class StubNewsApiClient:
+    latency = 0.2
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+
+    def get_everything(self, q=None, page_size=100, **kwargs):
+        time.sleep(self.latency)
+        now = datetime.now(timezone.utc)
+        return {"status": "ok", "articles": [
+            {
+                "title": random.choice(HEADLINE_TEMPLATES).format(q=q),
+                "publishedAt": (now - timedelta(minutes=random.randint(0, 7 * 24 * 60))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+            for _ in range(page_size)
+        ]}
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def stub_rapidapi_get(url, headers=None, params=None, **kwargs):
+    time.sleep(StubNewsApiClient.latency)
+    if "amazon" in url:
+        return StubResponse({
+            "product_title": f"Stub product {params.get('asin')}",
+            "reviews": [{"review_text": random.choice(REVIEW_TEMPLATES)} for _ in range(50)],
+        })
+    return StubResponse({"vendors": [{"Name": f"{params.get('Query')} Vendor {i}"} for i in range(5)]})
+
+
+def install_stubs(latency):
+    StubNewsApiClient.latency = latency
+    newsapi.NewsApiClient = StubNewsApiClient
+    requests.get = stub_rapidapi_get
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # Peak rather than current RSS, but still shows growth between levels
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_news_session(queries, timeout):
+    at = AppTest.from_file(os.path.join(ROOT, "Home.py"), default_timeout=timeout)
+    at.secrets["PREWARM_ENABLED"] = False
+    timings = []
+    started = time.perf_counter()
+    at.run()
+    page_load = time.perf_counter() - started
+    for query in queries:
+        at.text_input(key="news_query_input").input(query)
+        submit = next(b for b in at.button if b.label == "Analyze News Sentiment")
+        started = time.perf_counter()
+        submit.click().run()
+        timings.append(time.perf_counter() - started)
+    return at, page_load, timings
+
+
+def run_sapp_session(queries, timeout):
+    at = AppTest.from_file(os.path.join(ROOT, "utils", "sapp.py"), default_timeout=timeout)
+    at.secrets["PREWARM_ENABLED"] = False
+    timings = []
+    started = time.perf_counter()
+    at.run()
+    page_load = time.perf_counter() - started
+    for query in queries:
+        next(t for t in at.text_input if t.label == "Search Query").input(query)
+        submit = next(b for b in at.button if b.label == "Analyze Sentiment")
+        started = time.perf_counter()
+        submit.click().run()
+        timings.append(time.perf_counter() - started)
+    return at, page_load, timings
+
+
+def run_amazon_session(queries, timeout):
+    at = AppTest.from_file(os.path.join(ROOT, "pages", "Amazon_G2_Reviews.py"), default_timeout=timeout)
+    timings = []
+    started = time.perf_counter()
+    at.run()
+    page_load = time.perf_counter() - started
+    for query in queries:
+        next(t for t in at.text_input if t.label == "Enter Amazon ASIN").input(query)
+        submit = next(b for b in at.button if b.label == "Analyze Amazon Product")
+        started = time.perf_counter()
+        submit.click().run()
+        timings.append(time.perf_counter() - started)
+    return at, page_load, timings
+
+
+SCENARIOS = {"news": run_news_session, "sapp": run_sapp_session, "amazon": run_amazon_session}
+
+
+def run_level(scenario, sessions, iterations, timeout, warm):
+    # Every search gets its own query so each fetch misses st.cache_data; --warm
+    # has every search repeat one query instead
+    queries = [
+        ["AWS"] * iterations if warm else [f"topic-{sessions}-{i}-{j}" for j in range(iterations)]
+        for i in range(sessions)
+    ]
+    errors = []
+    lock = threading.Lock()
+
+    def session(session_queries):
+        try:
+            at, page_load, timings = SCENARIOS[scenario](session_queries, timeout)
+        except Exception as e:
+            at, page_load, timings = None, np.nan, []
+            with lock:
+                errors.append(e)
+        # Script errors are rendered by the app rather than raised
+        if at is not None and at.exception:
+            with lock:
+                errors.append(at.exception[0].value)
+        return at, page_load, timings
+
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(session, queries))
+    elapsed = time.perf_counter() - started
+    # Measured while every AppTest is still alive, like sessions held open on a server
+    rss_after = rss_mb()
+
+    # Cold page loads are reported on their own so the percentiles are search latency only
+    page_loads = np.array([page_load for _, page_load, _ in results]) * 1000
+    timings = np.array([t for _, _, session_timings in results for t in session_timings]) * 1000
+    if not len(timings):
+        timings = np.array([np.nan])
+    return {
+        "sessions": sessions,
+        "requests": int(np.isfinite(timings).sum()),
+        "errors": len(errors),
+        "page_load_p50_ms": np.nanpercentile(page_loads, 50) if np.isfinite(page_loads).any() else np.nan,
+        "p50_ms": np.percentile(timings, 50),
+        "p95_ms": np.percentile(timings, 95),
+        "p99_ms": np.percentile(timings, 99),
+        "throughput_rps": np.isfinite(timings).sum() / elapsed,
+        "rss_mb": rss_after,
+        "rss_per_session_mb": (rss_after - rss_before) / sessions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-session load test for the TrendTrackr Streamlit apps.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="news")
+    parser.add_argument("--sessions", default="1,5,10,25", help="Comma-separated concurrent session counts")
+    parser.add_argument("--iterations", type=int, default=3, help="Searches per session after the first page load")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stubbed upstream API latency in seconds")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-rerun AppTest timeout in seconds")
+    parser.add_argument("--warm", action="store_true", help="Every session runs the same (cached) query")
+    parser.add_argument("--csv", help="Also write the results table to this path")
+    args = parser.parse_args()
+
+    # AppTest threads have no ScriptRunContext, and the apps still pass use_container_width;
+    # keep both warnings out of the report. Streamlit resets the log level when it parses
+    # its config, so parse it first.
+    config.get_config_options()
+    set_log_level("error")
+    install_stubs(args.latency)
+    # One unmeasured session first, so imports and analyzer/model loading don't
+    # show up as memory growth of the first measured level
+    SCENARIOS[args.scenario](["warm-up"], args.timeout)
+    rows = []
+    for sessions in (int(n) for n in args.sessions.split(",")):
+        rows.append(run_level(args.scenario, sessions, args.iterations, args.timeout, args.warm))
+        print(f"{sessions} sessions: p95 {rows[-1]['p95_ms']:.0f} ms, {rows[-1]['errors']} errors", flush=True)
+
+    results = pd.DataFrame(rows)
+    print(results.round(1).to_markdown(index=False))
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class WarmStore:
+    # Process-wide results written by the prewarmer. An entry is only ever replaced
+    # by a successful refresh, so readers never see a gap while one is in flight and
+    # a failed refresh leaves the last good value in place until its TTL runs out.
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._entries = {}
+        self._requested = {}
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        # Caller holds the lock. Every typed query lands in _requested, so both
+        # dicts are swept of anything older than the TTL.
+        for key in [k for k, (stored, _) in self._entries.items() if now - stored >= self.ttl]:
+            del self._entries[key]
+        for key in [k for k, requested in self._requested.items() if now - requested >= self.ttl]:
+            del self._requested[key]
+        self._next_prune = now + min(self.ttl, 60)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._requested[key] = now
+            if now >= self._next_prune:
+                self._prune(now)
+            entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def recently_requested(self, keys):
+        # Only topics someone asked for within the TTL are worth an upstream call
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            return [key for key in keys if now - self._requested.get(key, -self.ttl) < self.ttl]
+
+
+def start_prewarmer(warm, topics, interval=3000, jitter=300, max_workers=2):
+    # Re-runs warm(topic) for every hot topic once per interval, so the shared store
+    # is refreshed before its TTL runs out. topics may be a callable returning the
+    # current list. Each topic gets a random offset within the jitter window and at
+    # most max_workers refreshes run at once.
+    stop = threading.Event()
+    in_flight = set()
+    lock = threading.Lock()
+
+    def refresh(topic):
+        try:
+            warm(topic)
+        except Exception:
+            logger.exception("Pre-warming failed for %r", topic)
+        finally:
+            with lock:
+                in_flight.discard(topic)
+
+    def loop():
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prewarm") as pool:
+            while not stop.is_set():
+                started = time.monotonic()
+                current = topics() if callable(topics) else topics
+                schedule = sorted((random.uniform(0, jitter), topic) for topic in current)
+                for offset, topic in schedule:
+                    if stop.wait(max(0.0, started + offset - time.monotonic())):
+                        return
+                    with lock:
+                        # A slow upstream shouldn't queue up a second refresh of the same topic
+                        if topic in in_flight:
+                            continue
+                        in_flight.add(topic)
+                    pool.submit(refresh, topic)
+                stop.wait(max(0.0, started + interval - time.monotonic()))
+
+    threading.Thread(target=loop, name="prewarmer", daemon=True).start()
+    return stop
@@ -0,0 +1,57 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+# Record-and-replay of raw upstream API responses.
+#
+#   API_REPLAY_MODE=record streamlit run Home.py   # live calls, responses saved as fixtures
+#   API_REPLAY_MODE=replay streamlit run Home.py   # fixtures only, no network
+#
+# Fixtures are gzipped JSON files named by a hash of the normalized request, so
+# "AWS " and "aws" share one recording and API keys never become part of the key.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPLAY_MODE = os.environ.get("API_REPLAY_MODE", "off")
+FIXTURES_DIR = os.environ.get("API_FIXTURES_DIR", os.path.join(ROOT, "fixtures", "api"))
+
+
+def normalize_params(params):
+    return {key: " ".join(str(value).split()).lower() for key, value in sorted(params.items()) if value is not None}
+
+
+def fixture_path(service, params, fixtures_dir=None):
+    key = json.dumps([service, normalize_params(params)], sort_keys=True)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(fixtures_dir or FIXTURES_DIR, service, f"{digest}.json.gz")
+
+
+def replayable(service, params, fetch, mode=None, fixtures_dir=None):
+    mode = mode or REPLAY_MODE
+    if mode not in ("off", "record", "replay"):
+        raise ValueError(f"API_REPLAY_MODE must be off, record or replay, not {mode!r}")
+    path = fixture_path(service, params, fixtures_dir)
+    if mode == "replay":
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            raise LookupError(f"No recorded {service} response for {normalize_params(params)}; record it with API_REPLAY_MODE=record") from None
+
+    response = fetch()
+    if mode == "record":
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Sessions and the prewarmer are threads of one process, so every writer
+        # needs its own temp file rather than one per pid
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp", delete=False) as raw:
+            with gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump({"service": service, "params": normalize_params(params), "response": response}, f, separators=(",", ":"))
+        # Atomic swap so a concurrent replay never reads a half-written fixture
+        try:
+            os.replace(raw.name, path)
+        except OSError:
+            # Another writer recorded the same request first; its fixture is just as good
+            if os.path.exists(raw.name):
+                os.remove(raw.name)
+    return response
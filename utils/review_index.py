@@ -0,0 +1,147 @@
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from wordcloud import STOPWORDS
+
+LABELS = ("Positive", "Negative", "Neutral")
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+QUERY_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+class ReviewIndex:
+    # Inverted index over analyze_sentiment output: one sorted postings array of
+    # row positions per (term, sentiment label), plus per-term counts and compound
+    # sums so drill-down queries never have to rescan the texts. Adjacent word
+    # pairs get their own postings so phrase queries are intersections too.
+
+    def __init__(self, df, text_column="text"):
+        texts = df[text_column].fillna("").astype(str).tolist()
+        self.size = len(texts)
+        self.labels = df["sentiment"].to_numpy()
+        compound = df["compound"].to_numpy(dtype=float)
+        label_ids = {label: i for i, label in enumerate(LABELS)}
+
+        self._normalized = []
+        postings = defaultdict(lambda: tuple([] for _ in LABELS))
+        bigrams = defaultdict(lambda: tuple([] for _ in LABELS))
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            self._normalized.append(" " + " ".join(tokens) + " ")
+            label = label_ids.get(self.labels[row])
+            if label is None:
+                continue
+            for term in set(tokens):
+                postings[term][label].append(row)
+            for pair in set(zip(tokens, tokens[1:])):
+                bigrams[" ".join(pair)][label].append(row)
+
+        self.terms = np.array(sorted(postings), dtype=object)
+        self._term_ids = {term: i for i, term in enumerate(self.terms)}
+        self._postings = {}
+        self.term_counts = np.zeros((len(self.terms), len(LABELS)), dtype=np.int64)
+        self.term_compound_sum = np.zeros(len(self.terms))
+        for i, term in enumerate(self.terms):
+            rows = tuple(np.array(ids, dtype=np.int64) for ids in postings[term])
+            self._postings[term] = rows
+            self.term_counts[i] = [len(ids) for ids in rows]
+            self.term_compound_sum[i] = sum(compound[ids].sum() for ids in rows)
+            self._postings[term] += (np.sort(np.concatenate(rows)),)
+        # Empty queries with a sentiment filter return one of these instead of scanning labels
+        self._label_rows = {label: np.flatnonzero(self.labels == label) for label in LABELS}
+        self._bigrams = {}
+        for pair, ids in bigrams.items():
+            rows = tuple(np.array(i, dtype=np.int64) for i in ids)
+            self._bigrams[pair] = rows + (np.sort(np.concatenate(rows)),)
+
+        # Rank terms per label once so top_terms() is a slice, not a sort
+        informative = np.array([term not in STOPWORDS and len(term) > 2 for term in self.terms], dtype=bool)
+        self._ranked = {}
+        for label, i in label_ids.items():
+            candidates = np.flatnonzero(informative & (self.term_counts[:, i] > 0))
+            self._ranked[label] = candidates[np.argsort(-self.term_counts[candidates, i], kind="stable")]
+
+    def postings(self, term, sentiment=None):
+        rows = (self._bigrams if " " in term else self._postings).get(term.lower())
+        if rows is None:
+            return np.empty(0, dtype=np.int64)
+        # The last slot holds the merged postings across all labels
+        return rows[-1 if sentiment is None else LABELS.index(sentiment)]
+
+    def search(self, query="", sentiment=None):
+        # All bare terms and "quoted phrases" in the query must match (AND).
+        terms, phrases = [], []
+        for phrase, term in QUERY_RE.findall(query or ""):
+            if phrase:
+                tokens = tokenize(phrase)
+                pairs = [" ".join(pair) for pair in zip(tokens, tokens[1:])]
+                terms.extend(pairs or tokens)
+                if len(tokens) > 2:
+                    # Consecutive pairs can still match out of order; check those rows
+                    phrases.append(" " + " ".join(tokens) + " ")
+            else:
+                terms.extend(tokenize(term))
+
+        if not terms:
+            return np.arange(self.size) if sentiment is None else self._label_rows[sentiment]
+
+        # Intersect from the shortest postings list up. A short list probes a much
+        # longer one by binary search; similar-sized lists go through a row mask.
+        lists = sorted((self.postings(term, sentiment) for term in set(terms)), key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            if len(rows) * 16 < len(other):
+                positions = np.searchsorted(other, rows).clip(max=len(other) - 1)
+                rows = rows[other[positions] == rows]
+            else:
+                mask = np.zeros(self.size, dtype=bool)
+                mask[other] = True
+                rows = rows[mask[rows]]
+        if phrases:
+            rows = np.array([row for row in rows if all(p in self._normalized[row] for p in phrases)], dtype=np.int64)
+        return rows
+
+    def term_stats(self, term):
+        i = self._term_ids.get(term.lower())
+        if i is None:
+            return None
+        counts = self.term_counts[i]
+        return {
+            "term": self.terms[i],
+            "count": int(counts.sum()),
+            "avg_compound": float(self.term_compound_sum[i] / counts.sum()),
+            **{label: int(counts[j]) for j, label in enumerate(LABELS)},
+        }
+
+    def top_terms(self, sentiment, k=10):
+        return [self.term_stats(term) for term in self.terms[self._ranked[sentiment][:k]]]
+
+
+def render_drill_down(df, index, label, placeholder, key, show_matches=True):
+    # Search box, sentiment filter, per-term stats and top terms over a ReviewIndex.
+    # Returns the matching rows; pass show_matches=False to render them yourself.
+    col_query, col_label = st.columns([3, 1])
+    query = col_query.text_input(label, placeholder=placeholder, key=f'{key}_query')
+    sentiment = col_label.selectbox("Sentiment", ["All", *LABELS], key=f'{key}_label')
+    matches = df.iloc[index.search(query, None if sentiment == "All" else sentiment)]
+    if show_matches:
+        st.dataframe(matches)
+    term_stats = [stats for stats in map(index.term_stats, tokenize(query)) if stats]
+    if term_stats:
+        st.dataframe(pd.DataFrame(term_stats), hide_index=True)
+    col_top_pos, col_top_neg = st.columns(2)
+    with col_top_pos:
+        st.markdown("**Top Positive Terms**")
+        st.dataframe(pd.DataFrame(index.top_terms("Positive"), columns=["term", "Positive", "avg_compound"]), hide_index=True)
+    with col_top_neg:
+        st.markdown("**Top Negative Terms**")
+        st.dataframe(pd.DataFrame(index.top_terms("Negative"), columns=["term", "Negative", "avg_compound"]), hide_index=True)
+    return matches
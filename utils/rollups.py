@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# Sentiment trend rollups. Timestamps are parsed once at ingest into int64 epoch
+# seconds and summed per bucket for every granularity, so the trend tab only has
+# to divide sum by count for the buckets it plots.
+
+GRANULARITIES = {"Hourly": 3600, "Daily": 86400, "Weekly": 7 * 86400}
+# 1970-01-01 was a Thursday; shifting by three days makes weekly buckets start on Monday
+BUCKET_OFFSETS = {"Weekly": 3 * 86400}
+EPOCH = pd.Timestamp(0, tz="UTC")
+
+
+def parse_epoch(published_at):
+    # NewsAPI timestamps mix ISO variants (with and without fractional seconds), so
+    # parse as ISO8601 rather than guessing a single format from the first row.
+    # Returns the epoch seconds and a mask of the rows that actually parsed.
+    timestamps = pd.to_datetime(pd.Series(published_at), utc=True, errors="coerce", format="ISO8601")
+    seconds = (timestamps - EPOCH).dt.total_seconds().to_numpy()
+    valid = ~np.isnan(seconds)
+    return np.where(valid, seconds, 0).astype(np.int64), valid
+
+
+def build_rollups(published_at, compound):
+    epoch, valid = parse_epoch(published_at)
+    compound = np.asarray(compound, dtype=float)
+    valid &= np.isfinite(compound)
+    epoch, compound = epoch[valid], compound[valid]
+
+    rollups = {}
+    for name, size in GRANULARITIES.items():
+        offset = BUCKET_OFFSETS.get(name, 0)
+        buckets = (epoch + offset) // size * size - offset
+        starts, inverse = np.unique(buckets, return_inverse=True)
+        rollups[name] = {
+            "start": starts,
+            "sum": np.bincount(inverse, weights=compound, minlength=len(starts)),
+            "count": np.bincount(inverse, minlength=len(starts)),
+        }
+    # Rows without a usable timestamp or score; callers surface this next to the chart
+    rollups["dropped"] = int((~valid).sum())
+    return rollups
+
+
+def rollup_frame(rollups, granularity="Daily"):
+    rollup = rollups[granularity]
+    return pd.DataFrame({
+        "period": pd.to_datetime(rollup["start"], unit="s", utc=True),
+        "compound": rollup["sum"] / rollup["count"],
+        "articles": rollup["count"],
+    })
@@ -1,11 +1,21 @@
+import os
+import sys
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from newsapi import NewsApiClient
 
+# `streamlit run utils/sapp.py` only puts utils/ on sys.path; add the repo root so
+# this app shares the utils package (scorer backends, scoring service client) with Home.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.prewarm import WarmStore, start_prewarmer
+from utils.replay import replayable
+from utils.rollups import GRANULARITIES, build_rollups, rollup_frame
+from utils.review_index import ReviewIndex, render_drill_down
+from utils.sentiment import label_sentiment, score_texts
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="Real-Time Sentiment Analysis - Sentiment Dashboard",
@@ -14,15 +24,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- VADER Sentiment Setup ---
-analyzer = SentimentIntensityAnalyzer()
-
 # --- Caching ---
-@st.cache_data(ttl=3600)
-def fetch_news(query, api_key):
+def request_news(query, api_key):
     newsapi = NewsApiClient(api_key=api_key)
     try:
-        all_articles = newsapi.get_everything(q=query, language='en', sort_by='relevancy', page_size=100)
+        params = {'q': query, 'language': 'en', 'sort_by': 'relevancy', 'page_size': 100}
+        all_articles = replayable('newsapi', params, lambda: newsapi.get_everything(**params))
         articles = all_articles.get('articles', [])
         if not articles:
             return None
@@ -30,13 +37,39 @@ def fetch_news(query, api_key):
     except Exception as e:
         raise RuntimeError(f"NewsAPI error: {e}")
 
+@st.cache_data(ttl=3600)
+def fetch_news(query, api_key):
+    return request_news(query, api_key)
+
 @st.cache_data(ttl=3600)
 def analyze_sentiment(df):
-    df['sentiment_scores'] = df['title'].apply(lambda t: analyzer.polarity_scores(t))
-    df['compound'] = df['sentiment_scores'].apply(lambda s: s['compound'])
-    df['sentiment'] = df['compound'].apply(lambda c: 'Positive' if c >= 0.05 else 'Negative' if c <= -0.05 else 'Neutral')
+    # Goes through the shared scoring service when SCORING_SERVICE_URL is set, in-process otherwise
+    df['compound'] = score_texts(df['title'], st.secrets.get("SCORING_SERVICE_URL"), backend=st.secrets.get("SENTIMENT_BACKEND"))
+    df['sentiment'] = df['compound'].apply(label_sentiment)
     return df
 
+@st.cache_resource
+def get_warm_store():
+    return WarmStore(ttl=3600)
+
+def warm_news_topic(query, api_key):
+    # Fetch outside st.cache_data and only swap the stored result in on success
+    articles = request_news(query, api_key)
+    if articles:
+        get_warm_store().put(query, analyze_sentiment(pd.DataFrame(articles)))
+
+@st.cache_resource
+def get_prewarmer(api_key):
+    # One refresher per server process, limited to hot topics requested within the TTL
+    hot_topics = list(st.secrets.get("PREWARM_TOPICS", [p for p in providers if p != "General"]))
+    store = get_warm_store()
+    return start_prewarmer(
+        lambda query: warm_news_topic(query, api_key), lambda: store.recently_requested(hot_topics),
+        interval=st.secrets.get("PREWARM_INTERVAL", 3000),
+        jitter=st.secrets.get("PREWARM_JITTER", 300),
+        max_workers=st.secrets.get("PREWARM_WORKERS", 2),
+    )
+
 def generate_wordcloud(text_series):
     text = ' '.join(text_series)
     if not text: return None
@@ -125,6 +158,7 @@ agent.run("Analyze reviews for ASIN B08N5WRWNW")
 
 if st.sidebar.button('Clear Cache'):
     st.cache_data.clear()
+    get_warm_store().clear()
     st.success("Cache cleared!")
 
 st.sidebar.markdown("---")
@@ -157,6 +191,10 @@ api_key = st.secrets.get("NEWS_API_KEY", "0ac47642d2d8408e9bf075473df6cbc7")
 if api_key == "0ac47642d2d8408e9bf075473df6cbc7":
     st.warning("Using fallback API key. Consider configuring secrets for security.")
 
+# --- Background Pre-warming of Provider Presets ---
+if st.secrets.get("PREWARM_ENABLED", False):
+    get_prewarmer(api_key)
+
 # --- Sentiment Analysis ---
 if submitted:
     if not search_query:
@@ -164,13 +202,15 @@ if submitted:
     else:
         with st.spinner("Brewing insights... ☕"):
             try:
-                articles = fetch_news(search_query, api_key)
-                if not articles:
+                df = get_warm_store().get(search_query)
+                articles = None if df is not None else fetch_news(search_query, api_key)
+                if df is None and not articles:
                     st.warning("No articles found for this query. Try a different topic.")
                 else:
-                    df = pd.DataFrame(articles)
-                    df = analyze_sentiment(df)
+                    df = df.copy() if df is not None else analyze_sentiment(pd.DataFrame(articles))
                     st.session_state['results_df'] = df
+                    st.session_state['rollups'] = build_rollups(df['publishedAt'], df['compound'])
+                    st.session_state['index'] = ReviewIndex(df, text_column='title')
                     st.session_state['search_query'] = search_query
             except Exception as e:
                 st.error(str(e))
@@ -208,9 +248,11 @@ if 'results_df' in st.session_state:
 
     with tab2:
         st.subheader("Sentiment Trend")
-        df['date'] = pd.to_datetime(df['publishedAt']).dt.date
-        sentiment_by_day = df.groupby('date')['compound'].mean().reset_index()
-        fig_line = px.line(sentiment_by_day, x='date', y='compound', markers=True)
+        granularity = st.radio("Granularity", list(GRANULARITIES), index=1, horizontal=True)
+        sentiment_by_period = rollup_frame(st.session_state['rollups'], granularity)
+        if st.session_state['rollups']['dropped']:
+            st.warning(f"{st.session_state['rollups']['dropped']} articles had no parseable publish time and are left out of the trend.")
+        fig_line = px.line(sentiment_by_period, x='period', y='compound', markers=True, hover_data=['articles'])
         fig_line.update_layout(xaxis_title='Date', yaxis_title='Avg. Sentiment Score',
                                paper_bgcolor='white', plot_bgcolor='white')
         st.plotly_chart(fig_line, use_container_width=True)
@@ -233,7 +275,9 @@ if 'results_df' in st.session_state:
         st.subheader("Analyzed Headlines")
         csv = df[['title', 'sentiment', 'compound']].to_csv(index=False).encode('utf-8')
         st.download_button("📥 Download CSV", data=csv, file_name=f"{search_query}_sentiment.csv", mime='text/csv')
-        html_table = generate_html_table(df[['title', 'sentiment']])
+        index = st.session_state['index']
+        matches = render_drill_down(df, index, "Search Headlines", 'e.g. outage, "data center"', key='sapp_headline', show_matches=False)
+        html_table = generate_html_table(matches[['title', 'sentiment']])
         st.markdown(f'<div style="height: 400px; overflow-y: auto;">{html_table}</div>', unsafe_allow_html=True)
 
     with tab5:
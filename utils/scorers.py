@@ -0,0 +1,192 @@
+import argparse
+from abc import ABC, abstractmethod
+import queue
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Pluggable sentiment scorers. A backend turns a list of texts into an array of
+# compound scores in [-1, 1]; register new ones with @register_backend("name").
+
+BACKENDS = {}
+_instances = {}
+_batchers = {}
+_lock = threading.Lock()
+
+
+def register_backend(name):
+    def decorator(cls):
+        if getattr(cls, "__abstractmethods__", None):
+            raise TypeError(f"Backend {name!r} must implement {', '.join(sorted(cls.__abstractmethods__))}")
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def get_backend(name="vader"):
+    with _lock:
+        if name not in _instances:
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown sentiment backend {name!r}, choose from {sorted(BACKENDS)}")
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+def get_batcher(name="vader", **options):
+    # One shared queue per backend so concurrent callers in this process batch
+    # together; options (max_batch, max_wait, cache_size) apply on first use only
+    backend = get_backend(name)
+    with _lock:
+        if name not in _batchers:
+            _batchers[name] = MicroBatcher(backend, **options)
+        return _batchers[name]
+
+
+def backend_stats():
+    with _lock:
+        return [backend.throughput() for backend in _instances.values()]
+
+
+def batcher_stats():
+    with _lock:
+        return {name: {**batcher.stats, "cache_size": len(batcher.cache)} for name, batcher in _batchers.items()}
+
+
+class ScorerBackend(ABC):
+    name = None
+
+    def __init__(self):
+        self.stats = {"batches": 0, "texts": 0, "seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def score_batch(self, texts):
+        pass
+
+    def score(self, texts):
+        started = time.perf_counter()
+        scores = np.asarray(self.score_batch(list(texts)), dtype=float)
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self.stats["batches"] += 1
+            self.stats["texts"] += len(scores)
+            self.stats["seconds"] += elapsed
+        return scores
+
+    def throughput(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["texts_per_s"] = stats["texts"] / stats["seconds"] if stats["seconds"] else 0.0
+        return {"backend": self.name, **stats}
+
+
+@register_backend("vader")
+class VaderBackend(ScorerBackend):
+    def __init__(self):
+        super().__init__()
+        self.analyzer = SentimentIntensityAnalyzer()
+
+    def score_batch(self, texts):
+        return np.fromiter((self.analyzer.polarity_scores(t)["compound"] for t in texts), dtype=float, count=len(texts))
+
+
+@register_backend("stub")
+class StubBackend(ScorerBackend):
+    # Model-free word-list scorer for tests, demos and load tests on CPU-only boxes
+    POSITIVE = frozenset("good great love loved excellent best amazing awesome perfect happy fast easy reliable".split())
+    NEGATIVE = frozenset("bad terrible hate hated worst awful poor slow broken waste buggy disappointed inaccurate".split())
+    TOKEN_RE = re.compile(r"[a-z']+")
+
+    def score_batch(self, texts):
+        raw = np.array([
+            sum((word in self.POSITIVE) - (word in self.NEGATIVE) for word in self.TOKEN_RE.findall(t.lower()))
+            for t in texts
+        ], dtype=float)
+        # Same squashing VADER applies to its summed valence
+        return raw / np.sqrt(raw * raw + 15)
+
+
+class MicroBatcher:
+    # Concurrent requests are queued and drained by one worker, which keeps
+    # collecting jobs until max_batch texts are waiting or the oldest has waited
+    # max_wait seconds, then scores the batch once through a shared LRU cache.
+
+    def __init__(self, backend, max_batch=256, max_wait=0.005, cache_size=100_000):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.stats = {"requests": 0, "batches": 0, "texts": 0, "cache_hits": 0}
+        self._jobs = queue.Queue()
+        threading.Thread(target=self._run, name=f"micro-batcher-{backend.name}", daemon=True).start()
+
+    def submit(self, texts):
+        future = Future()
+        self._jobs.put((list(texts), future))
+        return future
+
+    def _run(self):
+        while True:
+            jobs = [self._jobs.get()]
+            size = len(jobs[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                try:
+                    job = self._jobs.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                jobs.append(job)
+                size += len(job[0])
+            try:
+                self._score(jobs)
+            except Exception as e:
+                for _, future in jobs:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _score(self, jobs):
+        missing = list({text for texts, _ in jobs for text in texts if text not in self.cache})
+        if missing:
+            self.cache.update(zip(missing, self.backend.score(missing).tolist()))
+        total = sum(len(texts) for texts, _ in jobs)
+        self.stats["requests"] += len(jobs)
+        self.stats["batches"] += 1
+        self.stats["texts"] += total
+        self.stats["cache_hits"] += total - len(missing)
+        for texts, future in jobs:
+            scores = []
+            for text in texts:
+                self.cache.move_to_end(text)
+                scores.append(self.cache[text])
+            future.set_result(scores)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-backend sentiment scoring throughput.")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated backend names")
+    parser.add_argument("--texts", type=int, default=10_000, help="Synthetic texts to score per backend")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    words = sorted(StubBackend.POSITIVE | StubBackend.NEGATIVE) + "the battery screen app watch is not very".split()
+    texts = [" ".join(random.choices(words, k=12)) for _ in range(args.texts)]
+    for name in args.backends.split(","):
+        backend = get_backend(name)
+        for start in range(0, len(texts), args.batch_size):
+            backend.score(texts[start:start + args.batch_size])
+        stats = backend.throughput()
+        print(f"{name:>8}: {stats['texts_per_s']:,.0f} texts/s over {stats['batches']} batches", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.scorers import BACKENDS, backend_stats, batcher_stats, get_batcher
+from utils.sentiment import label_sentiment
+
+# Local HTTP scoring service so UI replicas can share one warm analyzer and cache.
+#
+#   python -m utils.scoring_service --port 8600
+#   SCORING_SERVICE_URL=http://127.0.0.1:8600 streamlit run Home.py
+#
+# POST /score {"texts": [...], "backend": "vader"} -> {"compound": [...], "sentiment": [...]}
+# GET  /health -> {"status": "ok", "batchers": {...}, "backends": [...]}
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    default_backend = "vader"
+    timeout_s = 30
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._reply(404, {"error": "not found"})
+        self._reply(200, {"status": "ok", "batchers": batcher_stats(), "backends": backend_stats()})
+
+    def do_POST(self):
+        if self.path != "/score":
+            return self._reply(404, {"error": "not found"})
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            texts = [str(text) for text in payload["texts"]]
+            backend = payload.get("backend") or self.default_backend
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return self._reply(400, {"error": f"expected {{\"texts\": [...]}}: {e}"})
+        if backend not in BACKENDS:
+            return self._reply(400, {"error": f"unknown backend {backend!r}, choose from {sorted(BACKENDS)}"})
+        try:
+            compound = get_batcher(backend).submit(texts).result(timeout=self.timeout_s)
+        except Exception as e:
+            return self._reply(500, {"error": str(e)})
+        self._reply(200, {"compound": compound, "sentiment": [label_sentiment(c) for c in compound]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8600, backend="vader", max_batch=256, max_wait=0.005, cache_size=100_000):
+    get_batcher(backend, max_batch=max_batch, max_wait=max_wait, cache_size=cache_size)
+    handler = type("Handler", (ScoringHandler,), {"default_backend": backend})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local batch sentiment scoring service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="vader", help="Backend for requests that don't name one")
+    parser.add_argument("--max-batch", type=int, default=256, help="Texts per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5, help="Longest a request waits for its batch to fill")
+    parser.add_argument("--cache-size", type=int, default=100_000, help="Scored texts kept in the shared LRU cache")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.backend, args.max_batch, args.max_wait_ms / 1000, args.cache_size)
+    print(f"Scoring service listening on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
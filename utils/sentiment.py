@@ -1,10 +1,42 @@
+import os
+import time
+
 import pandas as pd
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import requests
+
+from utils.scorers import get_batcher
+
+# Point at a running utils.scoring_service to score out of process, e.g. http://127.0.0.1:8600
+SCORING_SERVICE_URL = os.environ.get("SCORING_SERVICE_URL", "")
+SENTIMENT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "vader")
+SERVICE_RETRY_AFTER = 30
+_service_down_until = 0.0
+
+def label_sentiment(compound):
+    return "Positive" if compound >= 0.05 else "Negative" if compound <= -0.05 else "Neutral"
 
-analyzer = SentimentIntensityAnalyzer()
+def score_texts(texts, service_url=None, timeout=5, backend=None):
+    global _service_down_until
+    texts = [str(t) for t in texts]
+    service_url = SCORING_SERVICE_URL if service_url is None else service_url
+    backend = backend or SENTIMENT_BACKEND
+    if service_url and texts and time.monotonic() >= _service_down_until:
+        try:
+            response = requests.post(f"{service_url.rstrip('/')}/score", json={"texts": texts, "backend": backend}, timeout=timeout)
+            response.raise_for_status()
+            compound = response.json()["compound"]
+            if not isinstance(compound, list) or len(compound) != len(texts):
+                raise ValueError(f"scoring service returned {len(compound)} scores for {len(texts)} texts")
+            return compound
+        except (requests.RequestException, ValueError, KeyError, TypeError):
+            # Fall back to in-process scoring and give the service a moment before retrying
+            _service_down_until = time.monotonic() + SERVICE_RETRY_AFTER
+    if not texts:
+        return []
+    return get_batcher(backend).submit(texts).result()
 
-def analyze_sentiment(texts):
+def analyze_sentiment(texts, service_url=None, backend=None):
     df = pd.DataFrame(texts, columns=["text"])
-    df["compound"] = df["text"].apply(lambda t: analyzer.polarity_scores(t)["compound"])
-    df["sentiment"] = df["compound"].apply(lambda c: "Positive" if c >= 0.05 else "Negative" if c <= -0.05 else "Neutral")
+    df["compound"] = score_texts(df["text"], service_url, backend=backend)
+    df["sentiment"] = df["compound"].apply(label_sentiment)
     return df